@@ -3,25 +3,62 @@ Simple Flask web app for Headache Tracking Chatbot.
 Clean, minimal UI - no fancy stuff.
 """
 
+import json
+import logging
 import os
-from flask import Flask, render_template, request, jsonify, session
+import threading
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import (
+    Flask,
+    Response,
+    render_template,
+    request,
+    jsonify,
+    session,
+    stream_with_context,
+)
+from flask_session import Session
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+import pandas as pd
 
 from fetch_headache_data import HeadacheDataFetcher
 
 from datetime import datetime, timedelta
-from collections import defaultdict, Counter
 
 # Load environment variables
 load_dotenv()
 
+# Keep the fetcher's progress chatter out of the web logs; warnings and
+# errors still come through
+logging.getLogger("fetch_headache_data").setLevel(logging.WARNING)
+
 app = Flask(__name__, static_folder='static')
-app.secret_key = os.urandom(24)
 
-# Initialize OpenAI
+# Stable secret from the environment so sessions survive restarts and are
+# shared across workers; the urandom fallback is for local development only
+app.secret_key = os.getenv("FLASK_SECRET_KEY") or os.urandom(24)
+
+# Server-side sessions: the headache data dump and chat history no longer
+# fit in (or get re-signed into) a 4KB cookie on every request. msgpack
+# serialization (via msgspec) is much faster and smaller than JSON.
+app.config.update(
+    SESSION_TYPE="filesystem",
+    SESSION_FILE_DIR=os.getenv("SESSION_FILE_DIR", "/tmp/headache_sessions"),
+    SESSION_SERIALIZATION_FORMAT="msgpack",
+)
+Session(app)
+
+# Initialize OpenAI (async client so chat requests don't block the worker
+# while the OpenAI round-trip is in flight; it reuses one connection pool)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+client = AsyncOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+
+# Sync client for the SSE streaming route (WSGI response generators are sync)
+sync_client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
 # System message
 SYSTEM_MESSAGE = """You are a helpful assistant for headache tracking. 
@@ -30,108 +67,163 @@ Be concise and friendly. Use simple language. and you are a gangster background
 user is called "Emily" and do a bit flirty with her.
 """
 
+# Keep only the most recent messages in the prompt/session so token cost
+# and request size stay bounded as the conversation grows
+CHAT_HISTORY_LIMIT = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
 
-def load_headache_data():
-    """Load headache data from Google Sheets."""
-    try:
-        service_account_path = os.getenv("SERVICE_ACCOUNT_PATH", "")
-        drive_folder_id = os.getenv("DRIVE_FOLDER_ID")
 
-        # Need either SERVICE_ACCOUNT_JSON (Docker) or SERVICE_ACCOUNT_PATH (local)
-        has_credentials = os.getenv("SERVICE_ACCOUNT_JSON") or service_account_path
-        if not has_credentials or not drive_folder_id:
-            return None
+# Process-level cache so /analysis and /api/analysis/data don't round-trip
+# to Google Sheets on every request (and stay under the Sheets API quota)
+CACHE_TTL = int(os.getenv("HEADACHE_CACHE_TTL", "300"))
+_DATA_CACHE = {"data": None, "ts": 0.0}
+_DATA_CACHE_LOCK = threading.Lock()
 
-        fetcher = HeadacheDataFetcher(
-            service_account_path=service_account_path or "/tmp/dummy.json",
-            drive_folder_id=drive_folder_id,
-        )
+# Shared fetcher so each request reuses one credentials/service object
+# instead of re-authenticating with Google per call
+_FETCHER = None
+_FETCHER_LOCK = threading.Lock()
 
-        # Suppress print output
-        import io
-        from contextlib import redirect_stdout
 
-        f = io.StringIO()
-        with redirect_stdout(f):
-            data = fetcher.get_headache_data()
+def get_fetcher():
+    """Return the shared HeadacheDataFetcher, or None if not configured."""
+    global _FETCHER
+    if _FETCHER is None:
+        with _FETCHER_LOCK:
+            if _FETCHER is None:
+                service_account_path = os.getenv("SERVICE_ACCOUNT_PATH", "")
+                drive_folder_id = os.getenv("DRIVE_FOLDER_ID")
+
+                # Need either SERVICE_ACCOUNT_JSON (Docker) or SERVICE_ACCOUNT_PATH (local)
+                has_credentials = (
+                    os.getenv("SERVICE_ACCOUNT_JSON") or service_account_path
+                )
+                if not has_credentials or not drive_folder_id:
+                    return None
+
+                _FETCHER = HeadacheDataFetcher(
+                    service_account_path=service_account_path or "/tmp/dummy.json",
+                    drive_folder_id=drive_folder_id,
+                )
+    return _FETCHER
+
+
+def _fetch_headache_data():
+    """Fetch headache data from Google Sheets (uncached)."""
+    try:
+        fetcher = get_fetcher()
+        if fetcher is None:
+            return None
 
-        return data
+        return fetcher.get_headache_data()
     except Exception as e:
         print(f"Error loading data: {e}")
         return None
 
 
+def load_headache_data():
+    """Load headache data, using the TTL cache when it's still fresh."""
+    if time.monotonic() - _DATA_CACHE["ts"] < CACHE_TTL:
+        return _DATA_CACHE["data"]
+
+    # Lock so concurrent requests don't stampede Google Sheets on expiry
+    with _DATA_CACHE_LOCK:
+        if time.monotonic() - _DATA_CACHE["ts"] < CACHE_TTL:
+            return _DATA_CACHE["data"]
+
+        data = _fetch_headache_data()
+        if data is not None:
+            _DATA_CACHE["data"] = data
+            _DATA_CACHE["ts"] = time.monotonic()
+        return data if data is not None else _DATA_CACHE["data"]
+
+
+def invalidate_data_cache():
+    """Force the next load_headache_data() call to refetch from Sheets."""
+    _DATA_CACHE["ts"] = 0.0
+
+
 def format_data_for_context(data):
     """Format headache data for AI context."""
     if not data:
         return "No data available."
 
-    formatted = f"User has {len(data)} headache records:\n\n"
+    # Build the dump with one join instead of quadratic += concatenation
+    parts = [f"User has {len(data)} headache records:\n"]
     for i, record in enumerate(data, 1):
-        formatted += f"Record {i}:\n"
-        for key, value in record.items():
-            if not key.startswith("_"):
-                formatted += f"{key}: {value}\n"
-        formatted += "\n"
-    return formatted
+        parts.append(f"Record {i}:")
+        parts.extend(
+            f"{key}: {value}" for key, value in record.items()
+        )
+        parts.append("")
+    return "\n".join(parts) + "\n"
 
 
-def parse_date(date_str):
-    """Parse date string in MM/DD/YYYY format."""
-    try:
-        if not date_str:
-            return None
+# Formatted dump memoized per cache refresh; it's the same for every
+# session, so it doesn't belong in per-session storage
+_CONTEXT_CACHE = {"ts": None, "text": ""}
+
 
-        # Handle various date formats
-        if isinstance(date_str, str):
-            # Try MM/DD/YYYY format (e.g., "11/5/2025")
-            if "/" in date_str:
-                # Split by space first to handle timestamps
-                date_part = date_str.split()[0] if " " in date_str else date_str
-                parts = date_part.split("/")
-                if len(parts) == 3:
-                    month, day, year = parts
-                    return datetime(int(year), int(month), int(day))
+def get_data_context():
+    """Return the formatted data dump for chat context, or None if no data."""
+    data = load_headache_data()
+    if not data:
         return None
-    except Exception as e:
-        print(f"Error parsing date '{date_str}': {e}")
+
+    ts = _DATA_CACHE["ts"]
+    if _CONTEXT_CACHE["ts"] != ts:
+        _CONTEXT_CACHE["text"] = format_data_for_context(data)
+        _CONTEXT_CACHE["ts"] = ts
+    return _CONTEXT_CACHE["text"]
+
+
+# Formats tried by parse_date, most common first
+_DATE_FORMATS = ("%m/%d/%Y",)
+
+
+def parse_date(date_str):
+    """Parse date string in MM/DD/YYYY format (e.g., "11/5/2025")."""
+    if not date_str or not isinstance(date_str, str):
         return None
 
+    # Split by space first to handle timestamps
+    date_part = date_str.split()[0] if " " in date_str else date_str
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_part, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# Canonical field names probed by the extractors, built once at import.
+# Records are normalized to lowercased/stripped keys first, so the old
+# case/whitespace/colon permutations collapse to a handful of probes.
+_PAIN_FIELDS = ("pain level", "pain", "pain_level", "pain scale")
+_DRUG_FIELDS = ("medication", "drug", "medicine")
+
+
+def _norm_record(record):
+    """Normalize record keys to stripped lowercase for single-probe lookups."""
+    return {str(k).strip().lower().rstrip(":"): v for k, v in record.items()}
+
 
 def extract_pain_level(record):
     """Extract pain level from record, trying multiple field name variations."""
-    # Try various field name combinations
-    field_names = [
-        "Pain Level",
-        "pain level",
-        "PAIN LEVEL",
-        "Pain Level ",
-        "Pain",
-        "pain",
-        "PAIN",
-        "Pain Level:",
-        "Pain level",
-        "Pain_Level",
-        "pain_level",
-    ]
+    norm = _norm_record(record)
 
-    for field_name in field_names:
-        pain_str = record.get(field_name, "")
+    for field_name in _PAIN_FIELDS:
+        pain_str = norm.get(field_name)
         if pain_str:
-            # Strip whitespace and try to convert
-            pain_str = str(pain_str).strip()
-            if pain_str:  # Make sure it's not empty after stripping
-                try:
-                    pain = float(pain_str)
-                    if pain >= 0:  # Accept 0 or positive values
-                        return pain
-                except (ValueError, TypeError):
-                    continue
-
-    # If no field found, try to find any field that might contain a number
-    # This is a fallback for unknown field names
-    for key, value in record.items():
-        if "pain" in key.lower() and value:
+            try:
+                pain = float(str(pain_str).strip())
+                if pain >= 0:  # Accept 0 or positive values
+                    return pain
+            except (ValueError, TypeError):
+                continue
+
+    # Fallback for unknown field names: any pain-ish field with a number
+    for key, value in norm.items():
+        if "pain" in key and value:
             try:
                 pain = float(str(value).strip())
                 if pain >= 0:
@@ -144,38 +236,18 @@ def extract_pain_level(record):
 
 def extract_drug(record):
     """Extract drug/medication from record, trying multiple field name variations."""
-    # Try various field name combinations
-    field_names = [
-        "Medication",
-        "medication",
-        "MEDICATION",
-        "Medication ",
-        "Drug",
-        "drug",
-        "DRUG",
-        "Drug ",
-        "Medication:",
-        "Drug:",
-        "medicine",
-        "Medicine",
-    ]
+    norm = _norm_record(record)
 
-    for field_name in field_names:
-        drug = record.get(field_name, "")
+    for field_name in _DRUG_FIELDS:
+        drug = norm.get(field_name)
         if drug:
             drug = str(drug).strip()
             if drug:  # Make sure it's not empty after stripping
                 return drug
 
-    # If no field found, try to find any field that might contain drug info
-    for key, value in record.items():
-        if (
-            any(
-                term in key.lower()
-                for term in ["drug", "medication", "medicine", "med"]
-            )
-            and value
-        ):
+    # Fallback for unknown field names: any medication-ish field
+    for key, value in norm.items():
+        if any(term in key for term in ("drug", "medication", "medicine", "med")) and value:
             drug = str(value).strip()
             if drug:
                 return drug
@@ -183,6 +255,67 @@ def extract_drug(record):
     return None
 
 
+def records_to_frame(data):
+    """Convert raw Sheets records into a DataFrame with canonical columns.
+
+    Resolves the messy header variants once, producing `date` (datetime),
+    `pain` (float) and `drug` (string or NaN) columns so the analyzers can
+    run vectorized instead of probing field names per record.
+    """
+    if not data:
+        return pd.DataFrame(columns=["date", "pain", "drug"])
+
+    df = pd.DataFrame(data)
+    df.columns = df.columns.astype(str).str.strip().str.lower().str.rstrip(":")
+
+    # Date: prefer an explicit date column, fall back to the form timestamp.
+    # Split off any time component, then parse MM/DD/YYYY in C.
+    date_col = next((c for c in ("date", "timestamp") if c in df.columns), None)
+    if date_col is not None:
+        raw = df[date_col].astype(str).str.split().str[0]
+        df["date"] = pd.to_datetime(raw, format="%m/%d/%Y", errors="coerce")
+    else:
+        df["date"] = pd.NaT
+
+    # Pain: first pain-ish column that actually coerces to numbers
+    # (skips e.g. "Pain location", which coerces to all-NaN)
+    pain = None
+    for col in [c for c in df.columns if "pain" in c and c != "date"]:
+        coerced = pd.to_numeric(df[col].astype(str).str.strip(), errors="coerce")
+        coerced = coerced.where(coerced >= 0)
+        if coerced.notna().any():
+            pain = coerced
+            break
+    df["pain"] = pain if pain is not None else float("nan")
+
+    # Drug: first medication-ish column with any non-empty value
+    drug = None
+    drug_terms = ("drug", "medication", "medicine")
+    for col in [c for c in df.columns if any(t in c for t in drug_terms)]:
+        stripped = df[col].fillna("").astype(str).str.strip()
+        stripped = stripped.where(stripped != "")
+        if stripped.notna().any():
+            drug = stripped
+            break
+    df["drug"] = drug if drug is not None else float("nan")
+
+    return df
+
+
+# Parsed frame memoized per dataset so the weekly and monthly analyzers
+# (and repeated dashboard hits) share one date-parse/coercion pass
+_FRAME_CACHE = {"key": None, "frame": None}
+
+
+def get_analysis_frame(data):
+    """Return the normalized DataFrame for `data`, parsing it only once."""
+    key = (_DATA_CACHE["ts"], id(data))
+    if _FRAME_CACHE["key"] != key:
+        _FRAME_CACHE["frame"] = records_to_frame(data)
+        _FRAME_CACHE["key"] = key
+    return _FRAME_CACHE["frame"]
+
+
 def analyze_weekly_data(data):
     """Analyze data for weekly view."""
     if not data:
@@ -201,86 +334,44 @@ def analyze_weekly_data(data):
     today = datetime.now()
     week_start = today - timedelta(days=7)
 
-    # Filter data for this week
-    week_data = []
-    for record in data:
-        # Try multiple possible date field names
-        date_str = (
-            record.get("Date", "")
-            or record.get("date", "")
-            or record.get("Timestamp", "")
-            or record.get("timestamp", "")
-        )
-        parsed_date = parse_date(date_str)
-        if parsed_date and parsed_date >= week_start:
-            week_data.append(record)
-
-    # Count unique days with headaches
-    headache_days_set = set()
-    pain_levels = []
-    drug_counts = defaultdict(int)  # Count per drug type
-    daily_counts = defaultdict(int)  # Headaches per day
-    daily_drug_counts = defaultdict(int)  # Drugs per day
-    daily_pain_levels = defaultdict(list)  # Pain levels per day
-
-    for record in week_data:
-        date_str = (
-            record.get("Date", "")
-            or record.get("date", "")
-            or record.get("Timestamp", "")
-            or record.get("timestamp", "")
-        )
-        parsed_date = parse_date(date_str)
-        if parsed_date:
-            date_key = parsed_date.date()
-            headache_days_set.add(date_key)
-            daily_counts[date_key] += 1
-
-            # Pain level
-            pain = extract_pain_level(record)
-            if pain is not None:
-                pain_levels.append(pain)
-                daily_pain_levels[date_key].append(pain)
-
-            # Drugs - count per drug type
-            drug = extract_drug(record)
-            if drug:
-                drug_counts[drug] += 1
-                daily_drug_counts[date_key] += 1
-
-    # Build daily data for charts (chronological order for charts)
-    daily_data = []
-    for i in range(7):
-        day = week_start + timedelta(days=i)
-        day_key = day.date()
-        count = daily_counts.get(day_key, 0)
-        has_headache = 1 if day_key in headache_days_set else 0
-        drug_count = daily_drug_counts.get(day_key, 0)
-        day_pain_levels = daily_pain_levels.get(day_key, [])
-        avg_pain_for_day = (
-            sum(day_pain_levels) / len(day_pain_levels) if day_pain_levels else 0
-        )
+    df = get_analysis_frame(data)
+    week = df[df["date"] >= week_start]
 
-        daily_data.append(
-            {
-                "date": day_key,
-                "day_name": day.strftime("%a"),
-                "count": count,
-                "has_headache": has_headache,
-                "drug_count": drug_count,
-                "pain_level": round(avg_pain_for_day, 1) if avg_pain_for_day > 0 else 0,
-            }
-        )
+    # Vectorized per-day aggregates (count, drugs taken, mean pain)
+    day_keys = week["date"].dt.date
+    daily_counts = day_keys.value_counts()
+    daily_drug_counts = week.groupby(day_keys, observed=True)["drug"].count()
+    daily_avg_pain = week.groupby(day_keys, observed=True)["pain"].mean()
+    drug_counts = week["drug"].value_counts()
+
+    def day_row(day, day_key):
+        count = int(daily_counts.get(day_key, 0))
+        avg_pain_for_day = daily_avg_pain.get(day_key)
+        avg_pain_for_day = float(avg_pain_for_day) if pd.notna(avg_pain_for_day) else 0
+        return {
+            "date": day_key,
+            "day_name": day.strftime("%a"),
+            "count": count,
+            "has_headache": 1 if count > 0 else 0,
+            "drug_count": int(daily_drug_counts.get(day_key, 0)),
+            "pain_level": round(avg_pain_for_day, 1) if avg_pain_for_day > 0 else 0,
+        }
+
+    # Build daily data for charts (chronological order for charts);
+    # each day's datetime/.date() pair is computed exactly once
+    week_days = [week_start + timedelta(days=i) for i in range(7)]
+    daily_data = [day_row(day, day.date()) for day in week_days]
 
     # Create sorted version for table (descending)
     daily_data_sorted = sorted(daily_data, key=lambda x: x["date"], reverse=True)
 
     # Calculate metrics
-    total_headaches = len(week_data)
-    headache_days = len(headache_days_set)
-    avg_pain = sum(pain_levels) / len(pain_levels) if pain_levels else 0
+    total_headaches = int(len(week))
+    headache_days = int(day_keys.nunique())
+    avg_pain = week["pain"].mean()
+    avg_pain = float(avg_pain) if pd.notna(avg_pain) else 0
     consistency = (headache_days / 7) * 100 if headache_days > 0 else 0
-    total_drugs = sum(drug_counts.values())
+    total_drugs = int(week["drug"].count())
 
     return {
         "total_headaches": total_headaches,
@@ -288,7 +379,7 @@ def analyze_weekly_data(data):
         "avg_pain": round(avg_pain, 1),
         "consistency": round(consistency, 1),
         "total_drugs": total_drugs,
-        "drugs_by_type": dict(drug_counts),
+        "drugs_by_type": {str(k): int(v) for k, v in drug_counts.items()},
         "daily_data": daily_data,  # Chronological order for charts
         "daily_data_sorted": daily_data_sorted,  # Descending order for table
         "weekly_trend": [],
@@ -316,65 +407,27 @@ def analyze_monthly_data(data):
         month_start.replace(month=month_start.month % 12 + 1, day=1) - timedelta(days=1)
     ).day
 
-    # Filter data for this month
-    month_data = []
-    for record in data:
-        date_str = (
-            record.get("Date", "")
-            or record.get("date", "")
-            or record.get("Timestamp", "")
-            or record.get("timestamp", "")
-        )
-        parsed_date = parse_date(date_str)
-        if parsed_date and parsed_date >= month_start:
-            month_data.append(record)
-
-    # Count unique days with headaches
-    headache_days_set = set()
-    pain_levels = []
-    drug_counts = defaultdict(int)
-    weekly_counts = defaultdict(int)  # Headaches per week
-
-    for record in month_data:
-        date_str = (
-            record.get("Date", "")
-            or record.get("date", "")
-            or record.get("Timestamp", "")
-            or record.get("timestamp", "")
-        )
-        parsed_date = parse_date(date_str)
-        if parsed_date:
-            date_key = parsed_date.date()
-            headache_days_set.add(date_key)
-
-            # Calculate week number (1-4)
-            week_num = ((parsed_date - month_start).days // 7) + 1
-            if week_num > 4:
-                week_num = 4
-            weekly_counts[week_num] += 1
-
-            # Pain level
-            pain = extract_pain_level(record)
-            if pain is not None:
-                pain_levels.append(pain)
-
-            # Drugs - count per drug type
-            drug = extract_drug(record)
-            if drug:
-                drug_counts[drug] += 1
+    df = get_analysis_frame(data)
+    month = df[df["date"] >= month_start]
+
+    # Vectorized aggregates: week-of-month (clamped to 1-4) and drug counts
+    week_nums = ((month["date"] - month_start).dt.days // 7 + 1).clip(upper=4)
+    weekly_counts = week_nums.value_counts()
+    drug_counts = month["drug"].value_counts()
 
     # Build weekly data for charts
-    weekly_data = []
-    for week in range(1, 5):
-        count = weekly_counts.get(week, 0)
-        weekly_data.append({"week": week, "count": count})
+    weekly_data = [
+        {"week": week, "count": int(weekly_counts.get(week, 0))}
+        for week in range(1, 5)
+    ]
 
     # Calculate metrics
-    total_headaches = len(month_data)
-    headache_days = len(headache_days_set)
-    avg_pain = sum(pain_levels) / len(pain_levels) if pain_levels else 0
+    total_headaches = int(len(month))
+    headache_days = int(month["date"].dt.date.nunique())
+    avg_pain = month["pain"].mean()
+    avg_pain = float(avg_pain) if pd.notna(avg_pain) else 0
     consistency = (headache_days / days_in_month) * 100 if headache_days > 0 else 0
-    total_drugs = sum(drug_counts.values())
+    total_drugs = int(month["drug"].count())
 
     return {
         "total_headaches": total_headaches,
@@ -382,7 +435,7 @@ def analyze_monthly_data(data):
         "avg_pain": round(avg_pain, 1),
         "consistency": round(consistency, 1),
         "total_drugs": total_drugs,
-        "drugs_by_type": dict(drug_counts),
+        "drugs_by_type": {str(k): int(v) for k, v in drug_counts.items()},
         "weekly_data": weekly_data,
         "monthly_trend": [],
     }
@@ -401,7 +454,6 @@ def index():
         data = load_headache_data()
         if data:
             session["data_loaded"] = True
-            session["headache_data"] = format_data_for_context(data)
             session["data_count"] = len(data)
         else:
             session["data_count"] = 0
@@ -415,11 +467,11 @@ def index():
 
 @app.route("/api/load-data", methods=["POST"])
 def api_load_data():
-    """Load headache data."""
+    """Reload headache data, bypassing the cache."""
+    invalidate_data_cache()
     data = load_headache_data()
     if data:
         session["data_loaded"] = True
-        session["headache_data"] = format_data_for_context(data)
         session["data_count"] = len(data)
         session.modified = True
         return jsonify(
@@ -434,7 +486,7 @@ def api_load_data():
 
 
 @app.route("/api/chat", methods=["POST"])
-def api_chat():
+async def api_chat():
     """Handle chat messages."""
     if not client:
         return jsonify({"success": False, "message": "OpenAI API not configured"})
@@ -446,25 +498,25 @@ def api_chat():
     # Build conversation
     messages = [{"role": "system", "content": SYSTEM_MESSAGE}]
 
-    # Add data context if loaded
-    if session.get("data_loaded") and "headache_data" in session:
+    # Add data context if available (shared cache, not per-session storage)
+    data_context = get_data_context()
+    if data_context:
         messages.append(
-            {"role": "system", "content": f"User's data:\n{session['headache_data']}"}
+            {"role": "system", "content": f"User's data:\n{data_context}"}
         )
 
-    # Add conversation history
+    # Add conversation history (bounded window of most recent messages)
     if "messages" not in session:
         session["messages"] = []
 
-    for msg in session["messages"]:
-        messages.append(msg)
+    messages.extend(session["messages"][-CHAT_HISTORY_LIMIT:])
 
     # Add current message
     messages.append({"role": "user", "content": user_message})
 
     try:
         # Get response from OpenAI
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.7,
@@ -473,9 +525,14 @@ def api_chat():
 
         assistant_message = response.choices[0].message.content
 
-        # Save to session
-        session["messages"].append({"role": "user", "content": user_message})
-        session["messages"].append({"role": "assistant", "content": assistant_message})
+        # Save to session, trimmed to the same bounded window
+        session["messages"] = (
+            session["messages"]
+            + [
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message},
+            ]
+        )[-CHAT_HISTORY_LIMIT:]
         session.modified = True
 
         return jsonify({"success": True, "message": assistant_message})
@@ -483,6 +540,71 @@ def api_chat():
         return jsonify({"success": False, "message": f"Error: {str(e)}"})
 
 
+@app.route("/api/chat/stream", methods=["POST"])
+def api_chat_stream():
+    """Handle chat messages, streaming tokens back as server-sent events."""
+    if not sync_client:
+        return jsonify({"success": False, "message": "OpenAI API not configured"})
+
+    user_message = request.json.get("message", "").strip()
+    if not user_message:
+        return jsonify({"success": False, "message": "Empty message"})
+
+    # Build conversation (same context as /api/chat)
+    messages = [{"role": "system", "content": SYSTEM_MESSAGE}]
+
+    data_context = get_data_context()
+    if data_context:
+        messages.append(
+            {"role": "system", "content": f"User's data:\n{data_context}"}
+        )
+
+    if "messages" not in session:
+        session["messages"] = []
+
+    messages.extend(session["messages"][-CHAT_HISTORY_LIMIT:])
+    messages.append({"role": "user", "content": user_message})
+
+    def generate():
+        chunks = []
+        try:
+            stream = sync_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True,
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield f"data: {json.dumps({'delta': delta})}\n\n"
+
+            # Persist history once the full reply is known. Headers are
+            # already sent at this point, so write the server-side session
+            # record directly instead of relying on response teardown.
+            session["messages"] = (
+                session["messages"]
+                + [
+                    {"role": "user", "content": user_message},
+                    {"role": "assistant", "content": "".join(chunks)},
+                ]
+            )[-CHAT_HISTORY_LIMIT:]
+            session.modified = True
+            app.session_interface.save_session(app, session, app.response_class())
+
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.route("/api/reset", methods=["POST"])
 def api_reset():
     """Reset conversation."""
@@ -494,7 +616,7 @@ def api_reset():
 @app.route("/analysis")
 def analysis():
     """Render the analysis dashboard page."""
-    # Always load fresh data when opening the dashboard
+    # Served from the TTL cache; use /api/load-data to force a refresh
     data = load_headache_data()
 
     # Get view type (weekly or monthly)
@@ -516,12 +638,24 @@ def api_analysis_data():
     data = load_headache_data()
     view = request.args.get("view", "weekly")
 
+    # Aggregates only change when the data cache refreshes or the day
+    # rolls over, so let clients revalidate with an ETag and skip the
+    # payload (304) when nothing moved
+    etag = f"{view}-{_DATA_CACHE['ts']}-{datetime.now().strftime('%Y%m%d')}"
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
     if view == "weekly":
         analysis_data = analyze_weekly_data(data)
     else:
         analysis_data = analyze_monthly_data(data)
 
-    return jsonify(analysis_data)
+    response = jsonify(analysis_data)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, must-revalidate"
+    return response
 
 
 @app.route("/input")
@@ -549,21 +683,11 @@ def api_submit_entry():
         if not date or not start_time or not pain_level or not headache:
             return jsonify({"success": False, "message": "Date, start time, pain level, and headache status are required"})
 
-        # Get service account credentials
-        service_account_path = os.getenv("SERVICE_ACCOUNT_PATH", "")
-        drive_folder_id = os.getenv("DRIVE_FOLDER_ID")
-
-        # Need either SERVICE_ACCOUNT_JSON (Docker) or SERVICE_ACCOUNT_PATH (local)
-        has_credentials = os.getenv("SERVICE_ACCOUNT_JSON") or service_account_path
-        if not has_credentials or not drive_folder_id:
+        # Reuse the shared fetcher and append entry
+        fetcher = get_fetcher()
+        if fetcher is None:
             return jsonify({"success": False, "message": "Google Sheets not configured"})
 
-        # Create fetcher and append entry
-        fetcher = HeadacheDataFetcher(
-            service_account_path=service_account_path or "/tmp/dummy.json",
-            drive_folder_id=drive_folder_id,
-        )
-
         success = fetcher.append_headache_entry(
             date=date,
             start_time=start_time,
@@ -588,6 +712,11 @@ def api_submit_entry():
         return jsonify({"success": False, "message": f"Error: {str(e)}"})
 
 
+# ASGI entry point so async views run concurrently
+# (serve with e.g. `uvicorn app:asgi_app`)
+asgi_app = WsgiToAsgi(app)
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5514))
     app.run(host="0.0.0.0", port=port, debug=False)
@@ -1,9 +1,11 @@
+import aiofiles
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import os
 import sys
 import asyncio
-from datetime import datetime
+import traceback
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
@@ -19,6 +21,7 @@ BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 USER_ID = int(os.getenv("USER_ID", "0"))
 CHANNEL_ID = int(os.getenv("CHANNEL_ID", "1435843328691404873"))
 TIMEZONE = os.getenv("TIMEZONE", "America/Denver")
+TZ = ZoneInfo(TIMEZONE)  # built once; ZoneInfo lookups aren't free per tick
 REMINDER_HOUR = int(os.getenv("REMINDER_HOUR", "21"))
 REMINDER_MINUTE = int(os.getenv("REMINDER_MINUTE", "40"))
 
@@ -28,37 +31,59 @@ FORM_LINK = "https://docs.google.com/forms/d/e/1FAIpQLSeJ3LqMj_tpM3-NyXht23HoKMq
 # Track if reminder was sent today (persist to file)
 LAST_REMINDER_FILE = "/tmp/last_reminder_date.txt"
 last_reminder_date = None
+_reminder_date_loaded = False  # whether the file has been consulted yet
 
+# Handle to the sleep-until-target scheduler task
+reminder_task = None
 
-def load_last_reminder_date():
-    """Load the last reminder date from file"""
+# Channel reference warmed up during on_ready's connectivity check
+reminder_channel = None
+
+
+async def load_last_reminder_date():
+    """Load the last reminder date from file without blocking the event loop"""
     global last_reminder_date
     try:
         if os.path.exists(LAST_REMINDER_FILE):
-            with open(LAST_REMINDER_FILE, "r") as f:
-                date_str = f.read().strip()
-                if date_str:
-                    last_reminder_date = datetime.fromisoformat(date_str).date()
-                    print(
-                        f"📅 Loaded last reminder date: {last_reminder_date}",
-                        flush=True,
-                    )
-                    return last_reminder_date
+            async with aiofiles.open(LAST_REMINDER_FILE, "r") as f:
+                date_str = (await f.read()).strip()
+            if date_str:
+                last_reminder_date = datetime.fromisoformat(date_str).date()
+                print(
+                    f"📅 Loaded last reminder date: {last_reminder_date}",
+                )
+                return last_reminder_date
     except Exception as e:
-        print(f"⚠️  Error loading last reminder date: {e}", flush=True)
+        print(f"⚠️  Error loading last reminder date: {e}")
     return None
 
 
-def save_last_reminder_date(date):
-    """Save the last reminder date to file"""
-    global last_reminder_date
+async def get_last_reminder_date():
+    """Return the last reminder date, loading it from file on first access"""
+    global _reminder_date_loaded
+    if not _reminder_date_loaded:
+        _reminder_date_loaded = True
+        if last_reminder_date is None:
+            await load_last_reminder_date()
+    return last_reminder_date
+
+
+async def save_last_reminder_date(date):
+    """Record the last reminder date, flushing to file only when it changes"""
+    global last_reminder_date, _reminder_date_loaded
+    _reminder_date_loaded = True  # memory is authoritative from here on
+    if date == last_reminder_date:
+        return  # in-memory state is authoritative; nothing new to flush
+
+    # Update memory first: the duplicate-send guard reads this variable,
+    # so a slow or failed file write can't cause a double reminder
+    last_reminder_date = date
     try:
-        with open(LAST_REMINDER_FILE, "w") as f:
-            f.write(date.isoformat())
-        last_reminder_date = date
-        print(f"💾 Saved last reminder date: {date}", flush=True)
+        async with aiofiles.open(LAST_REMINDER_FILE, "w") as f:
+            await f.write(date.isoformat())
+        print(f"💾 Saved last reminder date: {date}")
     except Exception as e:
-        print(f"❌ Error saving last reminder date: {e}", flush=True)
+        print(f"❌ Error saving last reminder date: {e}")
 
 
 # Set up bot with intents
@@ -70,21 +95,14 @@ bot = commands.Bot(command_prefix="!", intents=intents)
 @bot.event
 async def on_ready():
     """Called when bot successfully connects to Discord"""
-    global last_reminder_date
-
-    # Load last reminder date from file
-    if last_reminder_date is None:
-        load_last_reminder_date()
-
-    print(f"✅ Bot is online as {bot.user}", flush=True)
+    print(f"✅ Bot is online as {bot.user}")
     print(
         f"⏰ Reminders set for {REMINDER_HOUR:02d}:{REMINDER_MINUTE:02d} ({TIMEZONE})",
-        flush=True,
     )
-    print(f"📬 Will send reminders to Channel ID: {CHANNEL_ID}", flush=True)
+    print(f"📬 Will send reminders to Channel ID: {CHANNEL_ID}")
 
     # Verify channel access and test sending capability
-    print("🔍 Testing Discord connectivity...", flush=True)
+    print("🔍 Testing Discord connectivity...")
     channel = None
 
     # Try to get channel from cache first
@@ -93,64 +111,60 @@ async def on_ready():
     # If not in cache, fetch it
     if channel is None:
         try:
-            print(f"📡 Fetching channel {CHANNEL_ID}...", flush=True)
+            print(f"📡 Fetching channel {CHANNEL_ID}...")
             channel = await bot.fetch_channel(CHANNEL_ID)
-            print(f"✅ Successfully fetched channel: {channel.name}", flush=True)
+            print(f"✅ Successfully fetched channel: {channel.name}")
         except discord.NotFound:
-            print(f"❌ ERROR: Channel {CHANNEL_ID} not found!", flush=True)
+            print(f"❌ ERROR: Channel {CHANNEL_ID} not found!")
             print(
                 "💡 Make sure the channel ID is correct and the bot is in the server",
-                flush=True,
             )
             return
         except discord.Forbidden:
             print(
                 f"❌ ERROR: Bot doesn't have permission to access channel {CHANNEL_ID}",
-                flush=True,
             )
             print(
                 "💡 Make sure the bot has 'View Channels' and 'Send Messages' permissions",
-                flush=True,
             )
             return
         except Exception as e:
-            print(f"❌ ERROR fetching channel: {e}", flush=True)
-            import traceback
-
+            print(f"❌ ERROR fetching channel: {e}")
             traceback.print_exc()
             return
 
     # Test sending a message to verify permissions
     try:
-        print(f"🧪 Testing message send capability to #{channel.name}...", flush=True)
+        print(f"🧪 Testing message send capability to #{channel.name}...")
         test_msg = await channel.send(
             "🤖 Bot is online and ready! Testing connectivity..."
         )
-        print(f"✅ SUCCESS! Bot can send messages to #{channel.name}", flush=True)
-        # Wait a moment so the message is visible, then delete it
-        await asyncio.sleep(2)
+        print(f"✅ SUCCESS! Bot can send messages to #{channel.name}")
+        # The send already proved permissions; clean up right away
         await test_msg.delete()
-        print("✅ Test message sent and cleaned up", flush=True)
+        print("✅ Test message sent and cleaned up")
     except discord.Forbidden:
         print(f"❌ ERROR: Bot cannot send messages to #{channel.name}")
         print("💡 Make sure the bot has 'Send Messages' permission in this channel")
         return
     except discord.HTTPException as e:
         print(f"❌ ERROR sending test message: {e}")
-        import traceback
-
         traceback.print_exc()
         return
     except Exception as e:
         print(f"❌ Unexpected error testing message send: {e}")
-        import traceback
-
         traceback.print_exc()
         return
 
-    # Check if we missed yesterday's reminder (if bot was down)
-    now = datetime.now(ZoneInfo(TIMEZONE))
+    # Keep the verified channel so send_reminder doesn't re-resolve it
+    global reminder_channel
+    reminder_channel = channel
+
+    # Check if we missed yesterday's reminder (if bot was down);
+    # first access lazily loads the persisted date
+    now = datetime.now(TZ)
     today = now.date()
+    last_reminder_date = await get_last_reminder_date()
 
     # If last_reminder_date is None or not today, check if we should have sent one
     if last_reminder_date is None or last_reminder_date < today:
@@ -161,98 +175,88 @@ async def on_ready():
         if now > reminder_time_today:
             print(
                 f"⚠️  Reminder time for today ({today}) has passed. Last reminder was: {last_reminder_date}",
-                flush=True,
             )
             print(
                 "💡 Use !send-now command to manually send today's reminder if needed",
-                flush=True,
             )
         elif last_reminder_date is not None and last_reminder_date < today:
             print(
                 f"ℹ️  Last reminder was sent on {last_reminder_date}, waiting for today's reminder time",
-                flush=True,
             )
 
-    print("\n✅ Bot is ready! Waiting for reminder time...", flush=True)
+    print("\n✅ Bot is ready! Waiting for reminder time...")
 
-    # Start the reminder check loop
-    if not check_reminder_time.is_running():
-        check_reminder_time.start()
-        print("✅ Reminder check loop started", flush=True)
+    # Start the reminder scheduler
+    global reminder_task
+    if reminder_task is None or reminder_task.done():
+        reminder_task = asyncio.create_task(reminder_scheduler())
+        print("✅ Reminder scheduler started")
 
 
-@tasks.loop(seconds=60)
-async def check_reminder_time():
-    """Check every minute if it's time to send the reminder"""
-    global last_reminder_date
+def next_reminder_time(now):
+    """Return the next datetime at the configured reminder hour/minute"""
+    target = now.replace(
+        hour=REMINDER_HOUR, minute=REMINDER_MINUTE, second=0, microsecond=0
+    )
+    if target <= now:
+        target += timedelta(days=1)
+    return target
 
-    try:
-        # Get current time in specified timezone
-        now = datetime.now(ZoneInfo(TIMEZONE))
-        current_date = now.date()
-        current_hour = now.hour
-        current_minute = now.minute
-
-        # Debug logging every hour to verify bot is running
-        if current_minute == 0:
+
+async def reminder_scheduler():
+    """Sleep until the next reminder time instead of polling every minute"""
+    while not bot.is_closed():
+        try:
+            now = datetime.now(TZ)
+            target = next_reminder_time(now)
             print(
-                f"🕐 Bot is running - Current time: {now.strftime('%Y-%m-%d %I:%M %p %Z')}, Last reminder: {last_reminder_date}",
-                flush=True,
+                f"⏰ Next reminder scheduled for {target.strftime('%Y-%m-%d %I:%M %p %Z')}",
             )
 
-        # Check if it's reminder time and we haven't sent it today
-        # Check within a 2-minute window (39-41) to handle timing issues
-        is_reminder_time = (
-            current_hour == REMINDER_HOUR
-            and current_minute >= REMINDER_MINUTE - 1
-            and current_minute <= REMINDER_MINUTE + 1
-        )
+            # Sleep to the target in bounded chunks, recomputing the
+            # remaining time so DST shifts or clock drift during a long
+            # sleep can't skew the wall-clock firing time
+            while True:
+                now = datetime.now(TZ)
+                remaining = (target - now).total_seconds()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, 3600))
+
+            now = datetime.now(TZ)
+            current_date = now.date()
+
+            # Skip if already sent today (e.g. manually via !send-now)
+            if await get_last_reminder_date() == current_date:
+                continue
 
-        if is_reminder_time and last_reminder_date != current_date:
             print(
-                f"⏰ Reminder time reached: {now.strftime('%Y-%m-%d %I:%M %p %Z')}",
-                flush=True,
+                f"📝 Last reminder was: {last_reminder_date}, Today is: {current_date}",
             )
+            await send_reminder()
+            await save_last_reminder_date(current_date)
             print(
-                f"📝 Last reminder was: {last_reminder_date}, Today is: {current_date}",
-                flush=True,
+                f"✅ Reminder sent at {now.strftime('%Y-%m-%d %I:%M %p %Z')}",
             )
-            try:
-                await send_reminder()
-                save_last_reminder_date(current_date)
-                print(
-                    f"✅ Reminder sent at {now.strftime('%Y-%m-%d %I:%M %p %Z')}",
-                    flush=True,
-                )
-            except Exception as e:
-                print(f"❌ Failed to send reminder: {e}", flush=True)
-                import traceback
 
-                traceback.print_exc()
-
-        # Log when we're close to reminder time for debugging
-        if current_hour == REMINDER_HOUR and current_minute == REMINDER_MINUTE - 5:
-            print("⏳ 5 minutes until reminder time...", flush=True)
-
-    except Exception as e:
-        print(f"❌ Error in reminder check: {e}", flush=True)
-        import traceback
-
-        traceback.print_exc()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Error in reminder scheduler: {e}")
+            traceback.print_exc()
+            # Back off briefly so a persistent failure can't spin the loop
+            await asyncio.sleep(60)
 
 
 async def send_reminder():
     """Send the daily headache reminder to the channel"""
+    global reminder_channel
     try:
-        # Get the channel
-        channel = bot.get_channel(CHANNEL_ID)
+        # Use the channel verified in on_ready; resolve it only if that
+        # warm-up never completed (e.g. reconnect edge cases)
+        channel = reminder_channel or bot.get_channel(CHANNEL_ID)
 
         if channel is None:
-            print(f"❌ Cannot find channel with ID: {CHANNEL_ID}")
-            print(
-                "💡 Make sure the bot has access to this channel and the ID is correct"
-            )
-            # Try fetching the channel instead of using cache
             try:
                 channel = await bot.fetch_channel(CHANNEL_ID)
                 print(f"✅ Successfully fetched channel: {channel.name}")
@@ -266,6 +270,8 @@ async def send_reminder():
                 print(f"❌ Error fetching channel: {e}")
                 return
 
+        reminder_channel = channel
+
         # Create the reminder message
         message = (
             "**Daily Headache Check-In**\n\n"
@@ -281,93 +287,87 @@ async def send_reminder():
 
     except discord.Forbidden:
         print("❌ Cannot send message to channel - check bot permissions")
-        import traceback
-
         traceback.print_exc()
     except discord.HTTPException as e:
         print(f"❌ Failed to send message: {e}")
-        import traceback
-
         traceback.print_exc()
     except Exception as e:
         print(f"❌ Unexpected error sending reminder: {e}")
-        import traceback
-
         traceback.print_exc()
 
 
+def authorized():
+    """Check that restricts a command to USER_ID (or anyone if unset)"""
+
+    async def predicate(ctx):
+        return USER_ID == 0 or ctx.author.id == USER_ID
+
+    return commands.check(predicate)
+
+
 @bot.command(name="test")
+@authorized()
 async def test_reminder(ctx):
     """Test command to manually trigger a reminder"""
-    if USER_ID == 0 or ctx.author.id == USER_ID:
-        try:
-            await send_reminder()
-            await ctx.send("✅ Test reminder sent! Check the reminder channel.")
-        except Exception as e:
-            await ctx.send(f"❌ Error sending test reminder: {e}")
-            print(f"❌ Error in test command: {e}")
-            import traceback
-
-            traceback.print_exc()
-    else:
-        await ctx.send("❌ You're not authorized to use this command.")
+    try:
+        await send_reminder()
+        await ctx.send("✅ Test reminder sent! Check the reminder channel.")
+    except Exception as e:
+        await ctx.send(f"❌ Error sending test reminder: {e}")
+        print(f"❌ Error in test command: {e}")
+        traceback.print_exc()
 
 
 @bot.command(name="test-connectivity")
+@authorized()
 async def test_connectivity(ctx):
     """Test if bot can send messages to the reminder channel"""
-    if USER_ID == 0 or ctx.author.id == USER_ID:
-        try:
-            channel = bot.get_channel(CHANNEL_ID)
-            if channel is None:
-                channel = await bot.fetch_channel(CHANNEL_ID)
-
-            test_msg = await channel.send(
-                "🧪 Connectivity test - if you see this, the bot can send messages!"
-            )
-            await ctx.send(
-                f"✅ Test message sent to #{channel.name}! Check the channel."
-            )
-            # Wait a moment, then clean up test message
-            await asyncio.sleep(3)
-            await test_msg.delete()
-            await ctx.send("✅ Test message cleaned up. Bot connectivity verified!")
-        except discord.Forbidden:
-            await ctx.send(
-                f"❌ Bot doesn't have permission to send messages to channel {CHANNEL_ID}"
-            )
-        except discord.NotFound:
-            await ctx.send(f"❌ Channel {CHANNEL_ID} not found")
-        except Exception as e:
-            await ctx.send(f"❌ Error: {e}")
-            print(f"❌ Error in test-connectivity: {e}")
-            import traceback
+    try:
+        channel = bot.get_channel(CHANNEL_ID)
+        if channel is None:
+            channel = await bot.fetch_channel(CHANNEL_ID)
 
-            traceback.print_exc()
-    else:
-        await ctx.send("❌ You're not authorized to use this command.")
+        test_msg = await channel.send(
+            "🧪 Connectivity test - if you see this, the bot can send messages!"
+        )
+        await ctx.send(
+            f"✅ Test message sent to #{channel.name}! Check the channel."
+        )
+        # Wait a moment, then clean up test message
+        await asyncio.sleep(3)
+        await test_msg.delete()
+        await ctx.send("✅ Test message cleaned up. Bot connectivity verified!")
+    except discord.Forbidden:
+        await ctx.send(
+            f"❌ Bot doesn't have permission to send messages to channel {CHANNEL_ID}"
+        )
+    except discord.NotFound:
+        await ctx.send(f"❌ Channel {CHANNEL_ID} not found")
+    except Exception as e:
+        await ctx.send(f"❌ Error: {e}")
+        print(f"❌ Error in test-connectivity: {e}")
+        traceback.print_exc()
 
 
 @bot.command(name="status")
+@authorized()
 async def status(ctx):
     """Check bot status and next reminder time"""
-    if USER_ID == 0 or ctx.author.id == USER_ID:
-        now = datetime.now(ZoneInfo(TIMEZONE))
-        channel = bot.get_channel(CHANNEL_ID)
-        channel_name = channel.name if channel else f"Channel ID: {CHANNEL_ID}"
-
-        status_msg = (
-            f"🤖 **Bot Status**\n\n"
-            f"✅ Online and running\n"
-            f"📅 Current time: {now.strftime('%Y-%m-%d %I:%M %p %Z')}\n"
-            f"⏰ Reminder time: {REMINDER_HOUR:02d}:{REMINDER_MINUTE:02d} ({TIMEZONE})\n"
-            f"📬 Reminder channel: {channel_name}\n"
-            f"📬 Last reminder: {'Today' if last_reminder_date == now.date() else 'Not sent today yet'}\n"
-        )
+    now = datetime.now(TZ)
+    channel = bot.get_channel(CHANNEL_ID)
+    channel_name = channel.name if channel else f"Channel ID: {CHANNEL_ID}"
+    last_reminder_date = await get_last_reminder_date()
+
+    status_msg = (
+        f"🤖 **Bot Status**\n\n"
+        f"✅ Online and running\n"
+        f"📅 Current time: {now.strftime('%Y-%m-%d %I:%M %p %Z')}\n"
+        f"⏰ Reminder time: {REMINDER_HOUR:02d}:{REMINDER_MINUTE:02d} ({TIMEZONE})\n"
+        f"📬 Reminder channel: {channel_name}\n"
+        f"📬 Last reminder: {'Today' if last_reminder_date == now.date() else 'Not sent today yet'}\n"
+    )
 
-        await ctx.send(status_msg)
-    else:
-        await ctx.send("❌ You're not authorized to use this command.")
+    await ctx.send(status_msg)
 
 
 @bot.command(name="ping")
@@ -378,26 +378,20 @@ async def ping(ctx):
 
 
 @bot.command(name="send-now")
+@authorized()
 async def send_now(ctx):
     """Manually send a reminder right now (useful for missed reminders)"""
-    global last_reminder_date
-
-    if USER_ID == 0 or ctx.author.id == USER_ID:
-        now = datetime.now(ZoneInfo(TIMEZONE))
-        try:
-            await send_reminder()
-            save_last_reminder_date(now.date())
-            await ctx.send(
-                f"✅ Reminder sent manually at {now.strftime('%Y-%m-%d %I:%M %p %Z')}"
-            )
-        except Exception as e:
-            await ctx.send(f"❌ Error sending reminder: {e}")
-            print(f"❌ Error in send-now command: {e}", flush=True)
-            import traceback
-
-            traceback.print_exc()
-    else:
-        await ctx.send("❌ You're not authorized to use this command.")
+    now = datetime.now(TZ)
+    try:
+        await send_reminder()
+        await save_last_reminder_date(now.date())
+        await ctx.send(
+            f"✅ Reminder sent manually at {now.strftime('%Y-%m-%d %I:%M %p %Z')}"
+        )
+    except Exception as e:
+        await ctx.send(f"❌ Error sending reminder: {e}")
+        print(f"❌ Error in send-now command: {e}")
+        traceback.print_exc()
 
 
 # Error handler
@@ -405,17 +399,16 @@ async def send_now(ctx):
 async def on_command_error(ctx, error):
     if isinstance(error, commands.CommandNotFound):
         return
+    if isinstance(error, commands.CheckFailure):
+        await ctx.send("❌ You're not authorized to use this command.")
+        return
     print(f"Command error: {error}")
-    import traceback
-
     traceback.print_exc()
 
 
 @bot.event
 async def on_error(event, *args, **kwargs):
     """Global error handler"""
-    import traceback
-
     print(f"❌ Error in event {event}:")
     traceback.print_exc()
 
@@ -8,11 +8,15 @@ This chatbot can:
 - Help with general health questions
 """
 
+import logging
 import os
+import pickle
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
+import httpx
 from dotenv import load_dotenv
 from openai import OpenAI
 
@@ -22,13 +26,30 @@ from fetch_headache_data import HeadacheDataFetcher
 # Load environment variables
 load_dotenv()
 
+# Fetcher logger; silent loads drop it to WARNING instead of redirecting stdout
+_fetch_logger = logging.getLogger("fetch_headache_data")
+
 # Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = "gpt-4o-mini"
 
+# Cap on non-system messages kept in the conversation, so token cost and
+# request size stay bounded in long sessions
+MAX_HISTORY_MESSAGES = int(os.getenv("CHAT_HISTORY_LIMIT", "20"))
+
+# On-disk cache of fetched records so a fresh process can skip the Google
+# Sheets round-trip; `reload` always bypasses it
+DATA_CACHE_FILE = os.getenv("HEADACHE_DATA_CACHE", "/tmp/headache_data_cache.pkl")
+DATA_CACHE_TTL = int(os.getenv("HEADACHE_DATA_CACHE_TTL", "3600"))
+
+# Optional cap on rows fetched from Sheets (0 = full history); recent rows
+# are what the analysis questions usually need
+FETCH_LIMIT = int(os.getenv("HEADACHE_FETCH_LIMIT", "0")) or None
+
 # ANSI color codes for terminal output
 class Colors:
     """Terminal color codes."""
+    __slots__ = ()
     HEADER = "\033[95m"
     BLUE = "\033[94m"
     CYAN = "\033[96m"
@@ -43,6 +64,18 @@ class Colors:
 class HeadacheChatbot:
     """Interactive chatbot for headache tracking assistance."""
 
+    # Fixed attribute set: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        "client",
+        "model",
+        "conversation_history",
+        "headache_fetcher",
+        "headache_data",
+        "data_loaded",
+        "_data_context",
+        "system_message",
+    )
+
     def __init__(self, api_key: str, model: str = MODEL):
         """
         Initialize the chatbot.
@@ -54,12 +87,20 @@ class HeadacheChatbot:
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-        self.client = OpenAI(api_key=api_key)
+        # One client for the whole session with an explicit keep-alive pool,
+        # so every turn reuses the same TLS connection to the API
+        self.client = OpenAI(
+            api_key=api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+            ),
+        )
         self.model = model
         self.conversation_history: List[Dict[str, str]] = []
         self.headache_fetcher = None
         self.headache_data = None  # Store fetched data in memory
         self.data_loaded = False  # Track if data has been loaded
+        self._data_context = None  # Formatted dump, cached per load
 
         # System message to set context
         self.system_message = """You are a helpful, empathetic assistant for tracking and analyzing headaches. 
@@ -113,6 +154,21 @@ Guidelines:
         if self.data_loaded and not force_reload:
             return self.headache_data
 
+        # Try the on-disk cache before going to Google Sheets
+        if not force_reload:
+            cached = self._read_data_cache()
+            if cached:
+                self.headache_data = cached
+                self.data_loaded = True
+                self._data_context = self._format_headache_data(cached)
+                self.conversation_history.append(
+                    {
+                        "role": "system",
+                        "content": f"User's headache tracking data (loaded at start of conversation):\n\n{self._data_context}\n\nThis data is available for analysis throughout the conversation.",
+                    }
+                )
+                return cached
+
         if self.headache_fetcher is None:
             if not self.initialize_headache_fetcher():
                 if not silent:
@@ -123,23 +179,28 @@ Guidelines:
             return None
 
         try:
-            # Temporarily redirect stdout if silent mode
+            # In silent mode, raise the fetcher's log level past its
+            # progress messages for the duration of the call
+            previous_level = _fetch_logger.level
             if silent:
-                import io
-                from contextlib import redirect_stdout
-                f = io.StringIO()
-                with redirect_stdout(f):
-                    data = self.headache_fetcher.get_headache_data()
-            else:
-                data = self.headache_fetcher.get_headache_data()
-            
-            # Store in memory
+                _fetch_logger.setLevel(logging.WARNING)
+            try:
+                data = self.headache_fetcher.get_headache_data(limit=FETCH_LIMIT)
+            finally:
+                if silent:
+                    _fetch_logger.setLevel(previous_level)
+
+
+            # Store in memory, formatting the context dump once per load
             self.headache_data = data
             self.data_loaded = True
-            
+            if data:
+                self._data_context = self._format_headache_data(data)
+                self._write_data_cache(data)
+
             # Add data context to conversation history (once)
             if data and not force_reload:
-                data_summary = self._format_headache_data(data)
+                data_summary = self._data_context
                 self.conversation_history.append(
                     {
                         "role": "system",
@@ -155,49 +216,93 @@ Guidelines:
 
     def chat(self, user_message: str, show_typing: bool = True) -> str:
         """
-        Send a message to the chatbot and get a response.
+        Send a message to the chatbot, streaming the reply to the terminal.
+
+        Tokens are printed as they arrive from OpenAI instead of waiting
+        for the full completion.
 
         Args:
             user_message: The user's message
             show_typing: Show typing indicator
 
         Returns:
-            The chatbot's response
+            The chatbot's full response
         """
         # Add user message to history
         self.conversation_history.append({"role": "user", "content": user_message})
+        self._trim_history()
 
         try:
             if show_typing:
                 print(f"{Colors.CYAN}💭 Thinking...{Colors.END}", end="", flush=True)
-            
-            # Get response from OpenAI
-            response = self.client.chat.completions.create(
+
+            # Stream the response from OpenAI
+            stream = self.client.chat.completions.create(
                 model=self.model,
                 messages=self.conversation_history,
                 temperature=0.7,
                 max_tokens=1500,
+                stream=True,
             )
 
-            assistant_message = response.choices[0].message.content
+            parts: List[str] = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if not parts and show_typing:
+                    # First token arrived: swap the thinking indicator for a check
+                    print(f"\r{Colors.GREEN}✓{Colors.END} ", end="", flush=True)
+                print(delta, end="", flush=True)
+                parts.append(delta)
+
+            assistant_message = "".join(parts)
 
             # Add assistant response to history
             self.conversation_history.append(
                 {"role": "assistant", "content": assistant_message}
             )
 
-            if show_typing:
-                print(f"\r{Colors.GREEN}✓{Colors.END} ", end="", flush=True)
-                time.sleep(0.2)
-
             return assistant_message
 
         except Exception as e:
             if show_typing:
                 print(f"\r{Colors.RED}✗{Colors.END} ", end="", flush=True)
             error_msg = f"{Colors.RED}❌ Error: {str(e)}{Colors.END}"
+            print(error_msg)
             return error_msg
 
+    def _read_data_cache(self) -> Optional[List[Dict]]:
+        """Return records from the pickle cache if it is still fresh."""
+        try:
+            if os.path.exists(DATA_CACHE_FILE):
+                age = time.time() - os.path.getmtime(DATA_CACHE_FILE)
+                if age < DATA_CACHE_TTL:
+                    with open(DATA_CACHE_FILE, "rb") as f:
+                        return pickle.load(f)
+        except Exception:
+            pass  # treat any cache problem as a miss
+        return None
+
+    def _write_data_cache(self, data: List[Dict]):
+        """Best-effort write of fetched records to the pickle cache."""
+        try:
+            with open(DATA_CACHE_FILE, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass  # cache is an optimization only
+
+    def _trim_history(self):
+        """Drop the oldest user/assistant turns beyond MAX_HISTORY_MESSAGES.
+
+        The system messages (instructions and the data context) are always
+        kept; only the conversational turns are windowed.
+        """
+        system = [m for m in self.conversation_history if m["role"] == "system"]
+        turns = [m for m in self.conversation_history if m["role"] != "system"]
+        if len(turns) > MAX_HISTORY_MESSAGES:
+            self.conversation_history = system + turns[-MAX_HISTORY_MESSAGES:]
+
     def _format_headache_data(self, data: List[Dict]) -> str:
         """
         Format headache data for the chatbot context.
@@ -211,17 +316,18 @@ Guidelines:
         if not data:
             return "No headache data found."
 
-        formatted = f"Total records: {len(data)}\n\n"
+        # Collect lines and join once instead of quadratic += concatenation;
+        # key names are cleaned (extra spaces, colons) inline
+        parts = [f"Total records: {len(data)}\n"]
         for i, record in enumerate(data, 1):
-            formatted += f"--- Record {i} ---\n"
-            for key, value in record.items():
-                if not key.startswith("_"):
-                    # Clean up key names (remove extra spaces, colons)
-                    clean_key = key.strip().rstrip(":")
-                    formatted += f"{clean_key}: {value}\n"
-            formatted += "\n"
+            parts.append(f"--- Record {i} ---")
+            parts.extend(
+                f"{key.strip().rstrip(':')}: {value}"
+                for key, value in record.items()
+            )
+            parts.append("")
 
-        return formatted
+        return "\n".join(parts) + "\n"
 
     def reset_conversation(self, keep_data: bool = True):
         """
@@ -233,8 +339,11 @@ Guidelines:
         self.conversation_history = [{"role": "system", "content": self.system_message}]
         
         # Re-add data context if it was loaded and we want to keep it
+        # (reuses the dump cached at load time instead of re-serializing)
         if keep_data and self.data_loaded and self.headache_data:
-            data_summary = self._format_headache_data(self.headache_data)
+            if self._data_context is None:
+                self._data_context = self._format_headache_data(self.headache_data)
+            data_summary = self._data_context
             self.conversation_history.append(
                 {
                     "role": "system",
@@ -288,15 +397,11 @@ def main():
         print(f"{Colors.RED}❌ Error initializing chatbot: {e}{Colors.END}")
         return
 
-    # Load headache data at startup
-    print(f"{Colors.CYAN}Loading headache data...{Colors.END}", end="", flush=True)
-    data = chatbot.load_headache_data(silent=True)
-    if data:
-        print(f" {Colors.GREEN}✓{Colors.END}")
-        print(f"{Colors.GREEN}✅ Loaded {len(data)} headache record(s) into memory{Colors.END}\n")
-    else:
-        print(f" {Colors.YELLOW}⚠{Colors.END}")
-        print(f"{Colors.YELLOW}⚠️  Could not load headache data (you can still use the chatbot){Colors.END}\n")
+    # Kick off the data load in the background so the Google Sheets
+    # round-trip overlaps with startup and the user typing their first message
+    print(f"{Colors.CYAN}Loading headache data in the background...{Colors.END}\n")
+    executor = ThreadPoolExecutor(max_workers=1)
+    data_future = executor.submit(chatbot.load_headache_data, silent=True)
 
     print_help()
 
@@ -338,12 +443,21 @@ def main():
             if not user_input:
                 continue
 
-            # Get response from chatbot
+            # Before the first message, make sure the background load finished
+            # so the data context is part of the conversation
+            if data_future is not None:
+                data = data_future.result()
+                data_future = None
+                executor.shutdown(wait=False)
+                if data:
+                    print(f"{Colors.GREEN}✅ Loaded {len(data)} headache record(s) into memory{Colors.END}")
+                else:
+                    print(f"{Colors.YELLOW}⚠️  Could not load headache data (continuing without it){Colors.END}")
+
+            # Get response from chatbot (streamed to the terminal as it arrives)
             print(f"\n{Colors.BOLD}{Colors.CYAN}Assistant:{Colors.END} ", end="", flush=True)
-            response = chatbot.chat(user_input)
-            # Print response with proper formatting
-            print(response)
-            print()
+            chatbot.chat(user_input)
+            print("\n")
 
         except KeyboardInterrupt:
             print(f"\n\n{Colors.GREEN}👋 Goodbye! Take care of your health!{Colors.END}\n")
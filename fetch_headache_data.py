@@ -8,29 +8,80 @@ This script uses the Google Sheets API and Google Drive API to:
 """
 
 import os
+import hashlib
 import json
+import logging
 import tempfile
+import time
+from datetime import datetime, time as time_of_day
+from itertools import zip_longest
 from typing import List, Dict, Optional
 
+import google_auth_httplib2
+import httplib2
 from dotenv import load_dotenv
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+# Module logger; consumers control verbosity with setLevel instead of
+# redirecting stdout around fetcher calls
+logger = logging.getLogger(__name__)
+
 # Configuration
 SERVICE_ACCOUNT_JSON = os.getenv("SERVICE_ACCOUNT_JSON")  # For deployment
 SERVICE_ACCOUNT_PATH = os.getenv("SERVICE_ACCOUNT_PATH")
 DRIVE_FOLDER_ID = os.getenv("DRIVE_FOLDER_ID")
 
+# Known spreadsheet ID; when set, the Drive files.list discovery call is
+# skipped entirely (one RTT and one Drive quota debit per invocation)
+SPREADSHEET_ID = os.getenv("SPREADSHEET_ID")
+
+# How long (seconds) to trust cached spreadsheet ID / sheet names before
+# re-querying Drive and Sheets; both change rarely within a process lifetime
+METADATA_TTL = int(os.getenv("SHEETS_META_TTL", "600"))
+
+# On-disk cache of raw fetched rows, keyed by the spreadsheet's Drive
+# modifiedTime: while the sheet is unchanged a reload costs one tiny
+# files.get instead of re-downloading the whole values payload
+RAW_CACHE_DIR = os.getenv(
+    "HEADACHE_RAW_CACHE_DIR", os.path.join(tempfile.gettempdir(), "headache_raw_cache")
+)
+
+# The sheet schema spans ten columns (Timestamp .. Headache?, see
+# _format_entry_row); bounding fetches to them keeps stray columns out of
+# the response payload
+DATA_COLUMNS = "A:J"
+
 # Google API scopes
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive.readonly",
 ]
 
+# Authenticated services cached per (credential source, scopes) so every
+# fetcher instance in the process shares the same credentials, discovery
+# documents, and HTTPS connection pools instead of rebuilding them per call
+_SERVICE_CACHE: Dict[tuple, tuple] = {}
+
+
+def _json_loads(data):
+    """Decode JSON with orjson when available (2-5x faster than stdlib)."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode JSON to bytes with orjson when available."""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
 
 class HeadacheDataFetcher:
     """Class to handle fetching headache data from Google Sheets."""
@@ -48,22 +99,44 @@ class HeadacheDataFetcher:
         self.credentials = None
         self.sheets_service = None
         self.drive_service = None
+        # Bound once after auth; each dotted access on a discovery Resource
+        # rebuilds the method object, so hot paths call these instead
+        self._spreadsheets = None
+        self._values = None
+        # (value, expires_at) pairs for rarely-changing metadata
+        self._spreadsheet_id_cache = None
+        self._sheet_names_cache = None
+
+    def _cache_key(self) -> tuple:
+        """Cache key identifying the credential source and scopes."""
+        if SERVICE_ACCOUNT_JSON:
+            source = ("env", SERVICE_ACCOUNT_JSON)
+        else:
+            source = ("file", self.service_account_path)
+        return (source, tuple(SCOPES))
 
     def authenticate(self):
         """Authenticate with Google APIs using service account credentials."""
+        # Reuse services built earlier in this process for the same credentials
+        cached = _SERVICE_CACHE.get(self._cache_key())
+        if cached:
+            self.credentials, self.sheets_service, self.drive_service = cached
+            self._bind_services()
+            return True
+
         try:
             # Check if SERVICE_ACCOUNT_JSON environment variable is set (for deployment)
             if SERVICE_ACCOUNT_JSON:
                 # Parse JSON from environment variable
                 try:
-                    service_account_info = json.loads(SERVICE_ACCOUNT_JSON)
+                    service_account_info = _json_loads(SERVICE_ACCOUNT_JSON)
                     self.credentials = (
                         service_account.Credentials.from_service_account_info(
                             service_account_info, scopes=SCOPES
                         )
                     )
-                except json.JSONDecodeError:
-                    print("❌ Invalid SERVICE_ACCOUNT_JSON format")
+                except ValueError:
+                    logger.error("❌ Invalid SERVICE_ACCOUNT_JSON format")
                     return False
             else:
                 # Load from file path (for local development)
@@ -74,19 +147,38 @@ class HeadacheDataFetcher:
                 )
 
             # Build API services
-            self.sheets_service = build("sheets", "v4", credentials=self.credentials)
-            self.drive_service = build("drive", "v3", credentials=self.credentials)
+            # One keep-alive transport shared by both services, so Sheets and
+            # Drive calls reuse the same TLS session instead of re-handshaking.
+            # httplib2.Http is not thread-safe, but this module only uses the
+            # services sequentially within a call.
+            authorized_http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=30)
+            )
+            self.sheets_service = build("sheets", "v4", http=authorized_http)
+            self.drive_service = build("drive", "v3", http=authorized_http)
 
-            print("✅ Successfully authenticated with Google APIs")
+            _SERVICE_CACHE[self._cache_key()] = (
+                self.credentials,
+                self.sheets_service,
+                self.drive_service,
+            )
+            self._bind_services()
+
+            logger.debug("✅ Successfully authenticated with Google APIs")
             return True
 
         except FileNotFoundError:
-            print(f"❌ Service account file not found: {self.service_account_path}")
+            logger.error(f"❌ Service account file not found: {self.service_account_path}")
             return False
         except Exception as e:
-            print(f"❌ Authentication failed: {e}")
+            logger.error(f"❌ Authentication failed: {e}")
             return False
 
+    def _bind_services(self):
+        """Bind the spreadsheets/values resources once for the hot paths."""
+        self._spreadsheets = self.sheets_service.spreadsheets()
+        self._values = self._spreadsheets.values()
+
     def find_spreadsheet(self) -> Optional[str]:
         """
         Find the headache tracking spreadsheet in the Drive folder.
@@ -94,6 +186,20 @@ class HeadacheDataFetcher:
         Returns:
             Spreadsheet ID if found, None otherwise
         """
+        # A known ID (env var or sidecar from an earlier run) skips Drive
+        if SPREADSHEET_ID:
+            return SPREADSHEET_ID
+
+        if self._spreadsheet_id_cache:
+            spreadsheet_id, expires_at = self._spreadsheet_id_cache
+            if time.monotonic() < expires_at:
+                return spreadsheet_id
+
+        sidecar = self._read_spreadsheet_id_sidecar()
+        if sidecar:
+            self._spreadsheet_id_cache = (sidecar, time.monotonic() + METADATA_TTL)
+            return sidecar
+
         try:
             # List files in the folder
             query = f"'{self.drive_folder_id}' in parents and mimeType='application/vnd.google-apps.spreadsheet' and trashed=false"
@@ -107,25 +213,66 @@ class HeadacheDataFetcher:
             files = results.get("files", [])
 
             if not files:
-                print(f"❌ No spreadsheets found in folder {self.drive_folder_id}")
+                logger.error(f"❌ No spreadsheets found in folder {self.drive_folder_id}")
                 return None
 
             # If multiple spreadsheets, return the first one (or most recent)
             # You can modify this logic to select a specific spreadsheet by name
             spreadsheet = files[0]
-            print(
+            logger.debug(
                 f"✅ Found spreadsheet: {spreadsheet['name']} (ID: {spreadsheet['id']})"
             )
 
+            self._spreadsheet_id_cache = (
+                spreadsheet["id"],
+                time.monotonic() + METADATA_TTL,
+            )
+            self._write_spreadsheet_id_sidecar(spreadsheet["id"])
             return spreadsheet["id"]
 
         except HttpError as e:
-            print(f"❌ Error finding spreadsheet: {e}")
+            logger.error(f"❌ Error finding spreadsheet: {e}")
             return None
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            logger.error(f"❌ Unexpected error: {e}")
             return None
 
+    def _spreadsheet_id_sidecar_path(self) -> str:
+        """Path of the file persisting the resolved spreadsheet ID."""
+        return os.path.join(RAW_CACHE_DIR, "spreadsheet_id.json")
+
+    def _read_spreadsheet_id_sidecar(self) -> Optional[str]:
+        """Return the persisted spreadsheet ID for this folder, if any."""
+        try:
+            with open(self._spreadsheet_id_sidecar_path(), "rb") as f:
+                payload = _json_loads(f.read())
+            # Keyed by folder so a changed DRIVE_FOLDER_ID forces re-discovery
+            if payload.get("drive_folder_id") == self.drive_folder_id:
+                return payload.get("spreadsheet_id")
+        except Exception:
+            pass  # Missing or unreadable sidecar just means re-discovery
+        return None
+
+    def _write_spreadsheet_id_sidecar(self, spreadsheet_id: str) -> None:
+        """Persist the resolved ID so later processes skip Drive discovery."""
+        try:
+            os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+            with open(self._spreadsheet_id_sidecar_path(), "wb") as f:
+                f.write(
+                    _json_dumps(
+                        {
+                            "drive_folder_id": self.drive_folder_id,
+                            "spreadsheet_id": spreadsheet_id,
+                        }
+                    )
+                )
+            logger.debug(
+                "💾 Cached spreadsheet ID; set SPREADSHEET_ID "
+                f"{spreadsheet_id} to skip discovery permanently"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Could not write spreadsheet ID sidecar: {e}")
+
     def get_sheet_names(self, spreadsheet_id: str) -> Optional[List[str]]:
         """
         Get the list of sheet names from the spreadsheet.
@@ -136,25 +283,33 @@ class HeadacheDataFetcher:
         Returns:
             List of sheet names, or None if error
         """
+        if self._sheet_names_cache:
+            (cached_id, sheet_names), expires_at = self._sheet_names_cache
+            if cached_id == spreadsheet_id and time.monotonic() < expires_at:
+                return sheet_names
+
         try:
-            spreadsheet = (
-                self.sheets_service.spreadsheets()
-                .get(spreadsheetId=spreadsheet_id)
-                .execute()
-            )
+            # Only the titles are needed; fields trims the response payload
+            spreadsheet = self._spreadsheets.get(
+                spreadsheetId=spreadsheet_id, fields="sheets.properties.title"
+            ).execute()
 
             sheets = spreadsheet.get("sheets", [])
             sheet_names = [sheet["properties"]["title"] for sheet in sheets]
 
             if sheet_names:
-                print(f"✅ Found sheets: {', '.join(sheet_names)}")
+                logger.debug(f"✅ Found sheets: {', '.join(sheet_names)}")
+            self._sheet_names_cache = (
+                (spreadsheet_id, sheet_names),
+                time.monotonic() + METADATA_TTL,
+            )
             return sheet_names
 
         except HttpError as e:
-            print(f"❌ Error getting sheet names: {e}")
+            logger.error(f"❌ Error getting sheet names: {e}")
             return None
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            logger.error(f"❌ Unexpected error: {e}")
             return None
 
     def fetch_data(
@@ -172,29 +327,74 @@ class HeadacheDataFetcher:
         """
         try:
             # Fetch the data
-            result = (
-                self.sheets_service.spreadsheets()
-                .values()
-                .get(spreadsheetId=spreadsheet_id, range=range_name)
-                .execute()
-            )
+            result = self._values.get(
+                spreadsheetId=spreadsheet_id, range=range_name
+            ).execute()
 
             values = result.get("values", [])
 
             if not values:
-                print("⚠️  No data found in spreadsheet")
+                logger.warning("⚠️  No data found in spreadsheet")
                 return []
 
-            print(f"✅ Fetched {len(values)} rows from spreadsheet")
+            logger.debug(f"✅ Fetched {len(values)} rows from spreadsheet")
             return values
 
         except HttpError as e:
-            print(f"❌ Error fetching data: {e}")
+            logger.error(f"❌ Error fetching data: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Unexpected error: {e}")
+            return None
+
+    def batch_fetch_data(
+        self, spreadsheet_id: str, ranges: List[str]
+    ) -> Optional[List[List[List[str]]]]:
+        """
+        Fetch several ranges in a single values.batchGet round-trip.
+
+        Args:
+            spreadsheet_id: The ID of the spreadsheet
+            ranges: Ranges to fetch (e.g., ["Sheet1!1:1", "Sheet1!50:100"])
+
+        Returns:
+            List of row lists, one per requested range, or None if error
+        """
+        try:
+            result = self._values.batchGet(
+                spreadsheetId=spreadsheet_id, ranges=ranges
+            ).execute()
+
+            value_ranges = result.get("valueRanges", [])
+            return [vr.get("values", []) for vr in value_ranges]
+
+        except HttpError as e:
+            logger.error(f"❌ Error fetching data: {e}")
             return None
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            logger.error(f"❌ Unexpected error: {e}")
             return None
 
+    def fetch_all_tabs(
+        self, spreadsheet_id: str, tabs: List[str]
+    ) -> Optional[Dict[str, List[List[str]]]]:
+        """
+        Fetch several sheet tabs in a single round-trip.
+
+        Args:
+            spreadsheet_id: The ID of the spreadsheet
+            tabs: Sheet names to fetch (e.g., from get_sheet_names)
+
+        Returns:
+            Dict mapping each tab name to its rows, or None if error
+        """
+        chunks = self.batch_fetch_data(
+            spreadsheet_id, [f"{tab}!{DATA_COLUMNS}" for tab in tabs]
+        )
+        if chunks is None:
+            return None
+        return dict(zip(tabs, chunks))
+
     def parse_headache_data(self, raw_data: List[List[str]]) -> List[Dict]:
         """
         Parse raw spreadsheet data into structured headache records.
@@ -212,39 +412,80 @@ class HeadacheDataFetcher:
             return []
 
         # First row is headers
-        headers = raw_data[0] if raw_data else []
+        headers = raw_data[0]
+        width = len(headers)
+
+        # One dict per non-empty row; zip_longest pads short rows with ""
+        # in C instead of a per-cell bounds check
+        return [
+            dict(zip_longest(headers, row[:width], fillvalue=""))
+            for row in raw_data[1:]
+            if row
+        ]
+
+    def get_headache_data(
+        self, range_name: str = "Sheet1", limit: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """
+        Main method to fetch and parse headache data.
 
-        # Parse data rows
-        records = []
-        for i, row in enumerate(raw_data[1:], start=2):  # Start at row 2 (skip header)
-            if not row:  # Skip empty rows
-                continue
+        Args:
+            range_name: The spreadsheet range to fetch
+            limit: If set, fetch only the most recent `limit` rows
+                   (plus the header) instead of the whole sheet
 
-            # Create a dictionary for this row
-            record = {}
-            for j, header in enumerate(headers):
-                value = row[j] if j < len(row) else ""
-                record[header] = value
+        Returns:
+            List of parsed headache records, or None if error
+        """
+        raw_data = self._fetch_raw(range_name, limit)
+        if raw_data is None:
+            return None
 
-            # Add row number for reference
-            record["_row_number"] = i
-            records.append(record)
+        # Parse data
+        parsed_data = self.parse_headache_data(raw_data)
 
-        return records
+        return parsed_data
 
-    def get_headache_data(self, range_name: str = "Sheet1") -> Optional[List[Dict]]:
+    def get_headache_dataframe(
+        self, range_name: str = "Sheet1", limit: Optional[int] = None
+    ):
         """
-        Main method to fetch and parse headache data.
+        Fetch headache data as a pandas DataFrame (columnar layout).
+
+        Analytics callers should prefer this over get_headache_data: the
+        values land directly in column arrays instead of one dict (and one
+        str per cell key) per row, so filters and groupbys run vectorized.
 
         Args:
             range_name: The spreadsheet range to fetch
+            limit: If set, fetch only the most recent `limit` rows
 
         Returns:
-            List of parsed headache records, or None if error
+            DataFrame with the sheet headers as columns, or None if error
         """
-        # Authenticate
-        if not self.authenticate():
+        import pandas as pd  # Deferred: the CLI/bot paths don't need pandas
+
+        raw_data = self._fetch_raw(range_name, limit)
+        if raw_data is None:
             return None
+        if not raw_data:
+            return pd.DataFrame()
+
+        headers = raw_data[0]
+        width = len(headers)
+        rows = [
+            row[:width] + [""] * (width - len(row)) for row in raw_data[1:] if row
+        ]
+        return pd.DataFrame(rows, columns=headers)
+
+    def _fetch_raw(
+        self, range_name: str, limit: Optional[int]
+    ) -> Optional[List[List[str]]]:
+        """Resolve the spreadsheet and sheet name, then fetch the raw rows."""
+        # Authenticate if not already done (credentials are reused)
+        if not self.sheets_service:
+            if not self.authenticate():
+                return None
 
         # Find spreadsheet
         spreadsheet_id = self.find_spreadsheet()
@@ -256,17 +497,112 @@ class HeadacheDataFetcher:
             sheet_names = self.get_sheet_names(spreadsheet_id)
             if sheet_names:
                 range_name = sheet_names[0]
-                print(f"📄 Using sheet: {range_name}")
+                logger.debug(f"📄 Using sheet: {range_name}")
+
+        # Serve unchanged sheets from the on-disk cache
+        modified_time = self._get_modified_time(spreadsheet_id)
+        cache_path = self._raw_cache_path(spreadsheet_id, range_name, limit)
+        if modified_time:
+            cached = self._read_raw_cache(cache_path, modified_time)
+            if cached is not None:
+                logger.debug("✅ Using cached rows (sheet unchanged)")
+                return cached
+
+        # With a limit, fetch only the header plus the last N data rows
+        if limit:
+            raw_data = self._fetch_tail(spreadsheet_id, range_name, limit)
+        else:
+            raw_data = self.fetch_data(spreadsheet_id, f"{range_name}!{DATA_COLUMNS}")
+
+        if raw_data is not None and modified_time:
+            self._write_raw_cache(cache_path, modified_time, raw_data)
+        return raw_data
+
+    def _get_modified_time(self, spreadsheet_id: str) -> Optional[str]:
+        """Fetch the spreadsheet's Drive modifiedTime (a cheap metadata call)."""
+        try:
+            meta = (
+                self.drive_service.files()
+                .get(fileId=spreadsheet_id, fields="modifiedTime")
+                .execute()
+            )
+            return meta.get("modifiedTime")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not read modifiedTime: {e}")
+            return None
 
-        # Fetch raw data
-        raw_data = self.fetch_data(spreadsheet_id, range_name)
-        if raw_data is None:
+    def _raw_cache_path(
+        self, spreadsheet_id: str, range_name: str, limit: Optional[int]
+    ) -> str:
+        """Cache file path for one (spreadsheet, range, limit) combination."""
+        key = hashlib.sha1(
+            f"{spreadsheet_id}|{range_name}|{limit}".encode()
+        ).hexdigest()
+        return os.path.join(RAW_CACHE_DIR, f"{key}.json")
+
+    def _read_raw_cache(
+        self, cache_path: str, modified_time: str
+    ) -> Optional[List[List[str]]]:
+        """Return cached rows if they match modified_time, else None."""
+        try:
+            with open(cache_path, "rb") as f:
+                payload = _json_loads(f.read())
+            if payload.get("modifiedTime") == modified_time:
+                return payload.get("values")
+        except Exception:
+            pass  # Missing or unreadable cache is just a miss
+        return None
+
+    def _write_raw_cache(
+        self, cache_path: str, modified_time: str, values: List[List[str]]
+    ) -> None:
+        """Persist fetched rows for reuse while the sheet stays unchanged."""
+        try:
+            os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                f.write(_json_dumps({"modifiedTime": modified_time, "values": values}))
+        except Exception as e:
+            logger.warning(f"⚠️  Could not write raw cache: {e}")
+
+    def _fetch_tail(
+        self, spreadsheet_id: str, range_name: str, limit: int
+    ) -> Optional[List[List[str]]]:
+        """
+        Fetch the header row plus the last `limit` data rows of a sheet.
+
+        Counts data rows from column A (cheap: one column instead of the
+        whole grid) and then requests just the tail range, so reloads move
+        O(limit) cells instead of the full history.
+
+        Args:
+            spreadsheet_id: The ID of the spreadsheet
+            range_name: The sheet name
+            limit: Maximum number of data rows to fetch
+
+        Returns:
+            Header plus tail rows, or None if error
+        """
+        first_column = self.fetch_data(spreadsheet_id, f"{range_name}!A:A")
+        if first_column is None:
             return None
 
-        # Parse data
-        parsed_data = self.parse_headache_data(raw_data)
+        total_rows = len(first_column)  # includes the header row
+        if total_rows <= limit + 1:
+            # Small sheet: fetching everything is already minimal
+            return self.fetch_data(spreadsheet_id, f"{range_name}!{DATA_COLUMNS}")
+
+        start = total_rows - limit + 1
+        first_col, last_col = DATA_COLUMNS.split(":")
+        ranges = [
+            f"{range_name}!{first_col}1:{last_col}1",
+            f"{range_name}!{first_col}{start}:{last_col}{total_rows}",
+        ]
+        chunks = self.batch_fetch_data(spreadsheet_id, ranges)
+        if chunks is None:
+            return None
 
-        return parsed_data
+        header, tail = chunks
+        return header + tail
 
     def append_headache_entry(
         self,
@@ -299,6 +635,86 @@ class HeadacheDataFetcher:
         Returns:
             True if successful, False otherwise
         """
+        entry = {
+            "date": date,
+            "start_time": start_time,
+            "pain_level": pain_level,
+            "pain_location": pain_location,
+            "triggers": triggers,
+            "medication": medication,
+            "medication_count": medication_count,
+            "headache": headache,
+            "notes": notes,
+        }
+        return self.append_headache_entries([entry], range_name=range_name)
+
+    def _format_entry_row(
+        self,
+        date: str,
+        start_time: str,
+        pain_level: str,
+        pain_location: str = "",
+        triggers: str = "",
+        medication: str = "",
+        medication_count: str = "",
+        headache: str = "Yes",
+        notes: str = "",
+    ) -> List[str]:
+        """Build one spreadsheet row from entry fields (see append_headache_entry)."""
+        # Generate timestamp (current date and time)
+        timestamp = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
+
+        # Format date as MM/DD/YYYY for consistency with existing data;
+        # fromisoformat is a C fast path for the YYYY-MM-DD input
+        try:
+            formatted_date = datetime.fromisoformat(date).strftime("%m/%d/%Y")
+        except ValueError:
+            formatted_date = date  # Use as-is if parsing fails
+
+        # Format start time (convert from 24h to 12h format with AM/PM)
+        try:
+            formatted_time = time_of_day.fromisoformat(start_time).strftime("%I:%M %p")
+        except ValueError:
+            formatted_time = start_time  # Use as-is if parsing fails
+
+        # Row data in the exact column order:
+        # Timestamp, Date, Start Time, Pain Scale, Pain location, Possible triggers,
+        # What medication did you take?, How many did you take?, Note, Headache?
+        return [
+            timestamp,              # Timestamp
+            formatted_date,          # Date
+            formatted_time,         # Start Time
+            pain_level,             # Pain Scale
+            pain_location,          # Pain location
+            triggers,               # Possible triggers
+            medication,             # What medication did you take?
+            medication_count,       # How many did you take?
+            notes,                  # Note
+            headache                # Headache?
+        ]
+
+    def append_headache_entries(
+        self, entries: List[Dict], range_name: str = "Sheet1"
+    ) -> bool:
+        """
+        Append several headache entries in a single API call.
+
+        One values.append carrying N rows costs the same quota and
+        round-trip as one carrying a single row, so burst writers should
+        collect entries and call this instead of looping over
+        append_headache_entry.
+
+        Args:
+            entries: List of dicts of append_headache_entry field values
+                     (date, start_time, pain_level, ...)
+            range_name: The sheet name to append to
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not entries:
+            return True
+
         try:
             # Authenticate if not already done
             if not self.sheets_service:
@@ -308,7 +724,7 @@ class HeadacheDataFetcher:
             # Find spreadsheet
             spreadsheet_id = self.find_spreadsheet()
             if not spreadsheet_id:
-                print("❌ Could not find spreadsheet")
+                logger.error("❌ Could not find spreadsheet")
                 return False
 
             # Get sheet names and use the first one if range_name is default
@@ -316,78 +732,40 @@ class HeadacheDataFetcher:
                 sheet_names = self.get_sheet_names(spreadsheet_id)
                 if sheet_names:
                     range_name = sheet_names[0]
-                    print(f"📄 Using sheet: {range_name}")
-
-            # Generate timestamp (current date and time)
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
-
-            # Format date as MM/DD/YYYY for consistency with existing data
-            try:
-                date_obj = datetime.strptime(date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%m/%d/%Y")
-            except ValueError:
-                formatted_date = date  # Use as-is if parsing fails
-
-            # Format start time (convert from 24h to 12h format with AM/PM)
-            try:
-                time_obj = datetime.strptime(start_time, "%H:%M")
-                formatted_time = time_obj.strftime("%I:%M %p")
-            except ValueError:
-                formatted_time = start_time  # Use as-is if parsing fails
-
-            # Prepare the row data in the exact column order:
-            # Timestamp, Date, Start Time, Pain Scale, Pain location, Possible triggers,
-            # What medication did you take?, How many did you take?, Note, Headache?
-            row_data = [
-                timestamp,              # Timestamp
-                formatted_date,          # Date
-                formatted_time,         # Start Time
-                pain_level,             # Pain Scale
-                pain_location,          # Pain location
-                triggers,               # Possible triggers
-                medication,             # What medication did you take?
-                medication_count,       # How many did you take?
-                notes,                  # Note
-                headache                # Headache?
-            ]
-
-            # Append the row
-            body = {"values": [row_data]}
-
-            result = (
-                self.sheets_service.spreadsheets()
-                .values()
-                .append(
-                    spreadsheetId=spreadsheet_id,
-                    range=f"{range_name}!A:A",
-                    valueInputOption="USER_ENTERED",
-                    insertDataOption="INSERT_ROWS",
-                    body=body,
-                )
-                .execute()
-            )
+                    logger.debug(f"📄 Using sheet: {range_name}")
+
+            # Append all rows at once
+            body = {"values": [self._format_entry_row(**entry) for entry in entries]}
+
+            result = self._values.append(
+                spreadsheetId=spreadsheet_id,
+                range=f"{range_name}!A:A",
+                valueInputOption="USER_ENTERED",
+                insertDataOption="INSERT_ROWS",
+                body=body,
+            ).execute()
 
             updated_cells = result.get("updates", {}).get("updatedCells", 0)
             if updated_cells > 0:
-                print(f"✅ Successfully added entry to spreadsheet")
+                logger.debug(
+                    f"✅ Successfully added {len(entries)} entry(ies) to spreadsheet"
+                )
                 return True
             else:
-                print("⚠️  No cells were updated")
+                logger.warning("⚠️  No cells were updated")
                 return False
 
         except HttpError as e:
-            print(f"❌ Error appending entry: {e}")
+            logger.error(f"❌ Error appending entry: {e}")
             return False
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"❌ Unexpected error: {e}")
             return False
 
 
 def main():
     """Main function to demonstrate usage."""
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     print("🚀 Starting Headache Data Fetcher...\n")
 
     # Initialize fetcher
@@ -405,8 +783,7 @@ def main():
         for i, record in enumerate(headache_data[:5], 1):
             print(f"Record {i}:")
             for key, value in record.items():
-                if not key.startswith("_"):
-                    print(f"  {key}: {value}")
+                print(f"  {key}: {value}")
             print()
 
         if len(headache_data) > 5: